@@ -6,4 +6,4 @@ Uses 'again' python module's 'events.EventSource' framework for event boilerplat
 again -> https://github.com/kashifrazzaqui/again#eventing-boilerplate
 """
 
-from jsonstreamer.jsonstreamer import JSONStreamer, ObjectStreamer
\ No newline at end of file
+from jsonstreamer.jsonstreamer import JSONStreamer, ObjectStreamer, JSONStreamerException
\ No newline at end of file
@@ -7,16 +7,21 @@ again -> https://github.com/kashifrazzaqui/again#eventing-boilerplate
 """
 
 from enum import Enum
-from sys import stdin, stdout
+from functools import lru_cache
+from sys import stdin, stdout, maxsize
 
 from again import events
 
 from .yajl.parse import YajlParser, YajlListener, YajlError
-from .tape import Tape
 
 JSONLiteralType = Enum('JSONValueType', 'STRING NUMBER BOOLEAN NULL')
 JSONCompositeType = Enum('JSONCompositeType', 'OBJECT ARRAY')
 
+# keys up to this length go through a cache of _KEY_CACHE_SIZE entries so that repeated keys share a single string
+# across the emitted objects, the cache is bounded so that a stream of distinct keys cannot grow it without limit
+_MAX_SHARED_KEY_LENGTH = 64
+_KEY_CACHE_SIZE = 1024
+
 
 class JSONStreamerException(Exception):
     def __init__(self, msg):
@@ -69,105 +74,86 @@ class JSONStreamer(events.EventSource, YajlListener):
     VALUE_EVENT = 'value'
     ELEMENT_EVENT = 'element'
 
-    def __init__(self):
+    def __init__(self, max_depth=None, max_string_size=None):
+        """
+        Args:
+            max_depth (int): optional limit on how deeply objects and arrays may be nested, deeper input raises a
+                `JSONStreamerException`
+            max_string_size (int): optional limit on the length of any key or string value, longer input raises a
+                `JSONStreamerException`. This is checked once yajl has buffered the whole key or string, so it does not
+                bound the memory taken by a long string split across many `consume` calls
+        """
         super(JSONStreamer, self).__init__()
-        self._file_like = Tape()
-        self._stack = []
-        self._pending_value = False
+        # unset limits are stored as sys.maxsize, which no depth or length can reach, so that enforcing them is always
+        # a single int comparison
+        self._max_depth = maxsize if max_depth is None else max_depth
+        self._max_string_size = maxsize if max_string_size is None else max_string_size
+        # nesting as a bit stack, the lowest bit is the innermost container: 1 for an object, 0 for an array
+        self._bits = 0
+        self._depth = 0
         self._started = False
+        # every event goes through _fire so that iter_events can collect events in place of firing them
+        self._fire = self.fire
         self._parser = YajlParser(self)
 
     def on_start_map(self, ctx):
-        self._stack.append(JSONCompositeType.OBJECT)
-        self._pending_value = False
-        self.fire(JSONStreamer.OBJECT_START_EVENT)
+        if self._depth >= self._max_depth:
+            raise JSONStreamerException('Maximum depth of {} exceeded'.format(self._max_depth))
+        self._bits = (self._bits << 1) | 1
+        self._depth += 1
+        self._fire(JSONStreamer.OBJECT_START_EVENT)
 
     def on_end_map(self, ctx):
-        self._stack.pop()
-        self._pending_value = False
-        self.fire(JSONStreamer.OBJECT_END_EVENT)
+        self._bits >>= 1
+        self._depth -= 1
+        self._fire(JSONStreamer.OBJECT_END_EVENT)
 
     def on_start_array(self, ctx):
-        self._stack.append(JSONCompositeType.ARRAY)
-        self.fire(JSONStreamer.ARRAY_START_EVENT)
+        if self._depth >= self._max_depth:
+            raise JSONStreamerException('Maximum depth of {} exceeded'.format(self._max_depth))
+        self._bits <<= 1
+        self._depth += 1
+        self._fire(JSONStreamer.ARRAY_START_EVENT)
 
     def on_end_array(self, ctx):
-        self._pending_value = False
-        self._stack.pop()
-        self.fire(JSONStreamer.ARRAY_END_EVENT)
+        self._bits >>= 1
+        self._depth -= 1
+        self._fire(JSONStreamer.ARRAY_END_EVENT)
 
     def on_map_key(self, ctx, value):
-        self.fire(JSONStreamer.KEY_EVENT, value)
-
-    def on_string(self, ctx, value):
-        top = self._stack[-1]
-        if top is JSONCompositeType.OBJECT:
-            self.fire(JSONStreamer.VALUE_EVENT, value)
-        elif top is JSONCompositeType.ARRAY:
-            self.fire(JSONStreamer.ELEMENT_EVENT, value)
+        if len(value) > self._max_string_size:
+            raise JSONStreamerException('Maximum string size of {} exceeded'.format(self._max_string_size))
+        self._fire(JSONStreamer.KEY_EVENT, value)
+
+    def _on_scalar(self, value):
+        if self._bits & 1:
+            self._fire(JSONStreamer.VALUE_EVENT, value)
+        elif self._depth:
+            self._fire(JSONStreamer.ELEMENT_EVENT, value)
         else:
             raise RuntimeError('Invalid json-streamer state')
 
+    def on_string(self, ctx, value):
+        if len(value) > self._max_string_size:
+            raise JSONStreamerException('Maximum string size of {} exceeded'.format(self._max_string_size))
+        self._on_scalar(value)
+
     def on_boolean(self, ctx, value):
-        top = self._stack[-1]
-        if top is JSONCompositeType.OBJECT:
-            self.fire(JSONStreamer.VALUE_EVENT, bool(value))
-        elif top is JSONCompositeType.ARRAY:
-            self.fire(JSONStreamer.ELEMENT_EVENT, bool(value))
-        else:
-            raise RuntimeError('Invalid json-streamer state')
+        self._on_scalar(bool(value))
 
     def on_null(self, ctx):
-        top = self._stack[-1]
-        if top is JSONCompositeType.OBJECT:
-            self.fire(JSONStreamer.VALUE_EVENT, None)
-        elif top is JSONCompositeType.ARRAY:
-            self.fire(JSONStreamer.ELEMENT_EVENT, None)
-        else:
-            raise RuntimeError('Invalid json-streamer state')
-
-    def on_integer(self, ctx, value):
-        top = self._stack[-1]
-        if top is JSONCompositeType.OBJECT:
-            self.fire(JSONStreamer.VALUE_EVENT, int(value))
-        elif top is JSONCompositeType.ARRAY:
-            self.fire(JSONStreamer.ELEMENT_EVENT, int(value))
-        else:
-            raise RuntimeError('Invalid json-streamer state')
-
-    def on_double(self, ctx, value):
-        top = self._stack[-1]
-        if top is JSONCompositeType.OBJECT:
-            self.fire(JSONStreamer.VALUE_EVENT, float(value))
-        elif top is JSONCompositeType.ARRAY:
-            self.fire(JSONStreamer.ELEMENT_EVENT, float(value))
-        else:
-            raise RuntimeError('Invalid json-streamer state')
+        self._on_scalar(None)
 
     def on_number(self, ctx, value):
-        ''' Since this is defined both integer and double callbacks are useless '''
-        value = int(value) if value.isdigit() else float(value)
-        top = self._stack[-1]
-        if top is JSONCompositeType.OBJECT:
-            self.fire(JSONStreamer.VALUE_EVENT, value)
-        elif top is JSONCompositeType.ARRAY:
-            self.fire(JSONStreamer.ELEMENT_EVENT, value)
-        else:
-            raise RuntimeError('Invalid json-streamer state')
-
-    def _on_literal(self, json_value_type, value):
-        top = self._stack[-1]
-        if top is JSONCompositeType.OBJECT:
-            if self._pending_value:
-                self._pending_value = False
-                self.fire(JSONStreamer.VALUE_EVENT, value)
-            else:
-                # must be a key
-                assert (json_value_type is JSONLiteralType.STRING)
-                self._pending_value = True
-                self.fire(JSONStreamer.KEY_EVENT, value)
-        elif top is JSONCompositeType.ARRAY:
-            self.fire(JSONStreamer.ELEMENT_EVENT, value)
+        ''' Since this is defined yajl never calls the integer and double callbacks '''
+        try:
+            value = int(value)
+        except ValueError as ve:
+            if '.' not in value and 'e' not in value and 'E' not in value:
+                # an integer longer than the interpreter's int() digit limit, which float() would turn into inf
+                raise JSONStreamerException(str(ve)) from ve
+            value = float(value)
+        self._on_scalar(value)
 
     def consume(self, data):
         """Takes input that must be parsed
@@ -176,21 +162,72 @@ class JSONStreamer(events.EventSource, YajlListener):
             Attach all your listeners before calling this method
 
         Args:
-            data (str): input json string
+            data (str|bytes|bytearray|memoryview): input json string, or UTF-8 encoded input json which is handed to
+                yajl directly
         """
-        if not self._started:
-            self.fire(JSONStreamer.DOC_START_EVENT)
-            self._started = True
-        self._file_like.write(data)
+        self._start()
+        if isinstance(data, str):
+            data = data.encode('utf-8')
         try:
-            self._parser.parse(self._file_like)
+            self._parser.parse_bytes(data)
         except YajlError as ye:
             raise JSONStreamerException(ye.value)
 
+    def iter_events(self, data):
+        """Takes input that must be parsed and returns an iterator over the resulting events instead of firing them to
+        listeners
+
+        This skips the listener dispatch of `fire` altogether, events are produced as (event, value) tuples where value
+        is None for events without a payload. `data` is parsed when this method is called, as with `consume`, so
+        chunks are always parsed in the order they are passed in whether or not the iterator is used
+
+        Note:
+            The `DOC_END_EVENT` is still fired to listeners by `close`
+
+        Args:
+            data (str|bytes|bytearray|memoryview): input json string, or UTF-8 encoded input json
+        """
+        collected = []
+        self._fire = lambda event, value=None: collected.append((event, value))
+        try:
+            self.consume(data)
+        finally:
+            self._fire = self.fire
+        return iter(collected)
+
+    def consume_file(self, fp, chunk_size=65536):
+        """Reads and parses a binary file-like object until it is exhausted
+
+        The file is read with `readinto` in chunks of `chunk_size` bytes into a single reused buffer which is handed to
+        yajl as is, so no intermediate strings are created
+
+        Note:
+            Attach all your listeners before calling this method. Everything up to the end of `fp` is parsed, so any
+            bytes following the JSON document are consumed as well
+
+        Args:
+            fp: file-like object opened in binary mode
+            chunk_size (int): number of bytes to read at a time
+        """
+        self._start()
+        buf = bytearray(chunk_size)
+        while True:
+            length = fp.readinto(buf)
+            if not length:
+                break
+            try:
+                self._parser.parse_bytes(buf, length)
+            except YajlError as ye:
+                raise JSONStreamerException(ye.value)
+
+    def _start(self):
+        if not self._started:
+            self._fire(JSONStreamer.DOC_START_EVENT)
+            self._started = True
+
     def close(self):
         """Closes the streamer which causes a `DOC_END_EVENT` to be fired  and frees up memory used by yajl"""
-        self.fire(JSONStreamer.DOC_END_EVENT)
-        self._stack = None
+        self._fire(JSONStreamer.DOC_END_EVENT)
         self._parser.close()
 
 
@@ -230,14 +267,39 @@ class ObjectStreamer(events.EventSource):
     PAIR_EVENT = 'pair'
     ELEMENT_EVENT = 'element'
 
-    def __init__(self):
+    # JSONStreamer events and the handlers they are wired to, listening explicitly rather than via `auto_listen` spares
+    # every fired event a name lookup on this object
+    _STREAMER_LISTENERS = (
+        (JSONStreamer.DOC_START_EVENT, '_on_doc_start'),
+        (JSONStreamer.DOC_END_EVENT, '_on_doc_end'),
+        (JSONStreamer.OBJECT_START_EVENT, '_on_object_start'),
+        (JSONStreamer.OBJECT_END_EVENT, '_on_object_end'),
+        (JSONStreamer.ARRAY_START_EVENT, '_on_array_start'),
+        (JSONStreamer.ARRAY_END_EVENT, '_on_array_end'),
+        (JSONStreamer.KEY_EVENT, '_on_key'),
+        (JSONStreamer.VALUE_EVENT, '_on_value'),
+        (JSONStreamer.ELEMENT_EVENT, '_on_element'),
+    )
+
+    def __init__(self, max_depth=None, max_string_size=None):
+        """
+        Args:
+            max_depth (int): optional nesting limit, passed on to the underlying `JSONStreamer`
+            max_string_size (int): optional key/string length limit, passed on to the underlying `JSONStreamer`; it is
+                checked only after the whole key or string has been buffered
+        """
         super(ObjectStreamer, self).__init__()
-        self._streamer = JSONStreamer()
-        self._streamer.auto_listen(self)
+        self._streamer = JSONStreamer(max_depth=max_depth, max_string_size=max_string_size)
+        # returns the first key seen that is equal to its argument
+        self._shared_key = lru_cache(maxsize=_KEY_CACHE_SIZE)(lambda key: key)
+        for event, handler in ObjectStreamer._STREAMER_LISTENERS:
+            self._streamer.add_listener(event, getattr(self, handler))
 
     def _on_doc_start(self):
         self._root = None
         self._obj_stack = []
+        # the JSONCompositeType of each entry in _obj_stack, so that nesting never has to inspect the containers
+        self._kind_stack = []
         self._key_stack = []
 
     def _on_doc_end(self):
@@ -250,36 +312,23 @@ class ObjectStreamer(events.EventSource):
         else:
             d = {}
             self._obj_stack.append(d)
+            self._kind_stack.append(JSONCompositeType.OBJECT)
 
     def _process_deep_entities(self):
         o = self._obj_stack.pop()
-        key_depth = len(self._key_stack)
-        if key_depth is 0:
-            if len(self._obj_stack) is 0:
-                self.fire(ObjectStreamer.ELEMENT_EVENT, o)
+        self._kind_stack.pop()
+        if not self._obj_stack:
+            if self._key_stack:
+                self.fire(ObjectStreamer.PAIR_EVENT, (self._key_stack.pop(), o))
             else:
-                self._obj_stack[-1].append(o)
-        elif key_depth is 1:
-            if len(self._obj_stack) is 0:
-                k = self._key_stack.pop()
-                self.fire(ObjectStreamer.PAIR_EVENT, (k, o))
-            else:
-                top = self._obj_stack[-1]
-                if isinstance(top, list):
-                    top.append(o)
-                else:
-                    k = self._key_stack.pop()
-                    top[k] = o
-        elif key_depth > 1:
-            current_obj = self._obj_stack[-1]
-            if type(current_obj) is list:
-                current_obj.append(o)
-            else:
-                k = self._key_stack.pop()
-                current_obj[k] = o
+                self.fire(ObjectStreamer.ELEMENT_EVENT, o)
+        elif self._kind_stack[-1] is JSONCompositeType.ARRAY:
+            self._obj_stack[-1].append(o)
+        else:
+            self._obj_stack[-1][self._key_stack.pop()] = o
 
     def _on_object_end(self):
-        if len(self._obj_stack) > 0:
+        if self._obj_stack:
             self._process_deep_entities()
         else:
             self.fire(ObjectStreamer.OBJECT_STREAM_END_EVENT)
@@ -290,25 +339,28 @@ class ObjectStreamer(events.EventSource):
             self.fire('array_stream_start')
         else:
             self._obj_stack.append(list())
+            self._kind_stack.append(JSONCompositeType.ARRAY)
 
     def _on_array_end(self):
-        if len(self._obj_stack) > 0:
+        if self._obj_stack:
             self._process_deep_entities()
         else:
             self.fire(ObjectStreamer.ARRAY_STREAM_END_EVENT)
 
     def _on_key(self, key):
+        if len(key) <= _MAX_SHARED_KEY_LENGTH:
+            key = self._shared_key(key)
         self._key_stack.append(key)
 
     def _on_value(self, value):
         k = self._key_stack.pop()
-        if len(self._obj_stack) is 0:
+        if not self._obj_stack:
             self.fire(ObjectStreamer.PAIR_EVENT, (k, value))
         else:
             self._obj_stack[-1][k] = value
 
     def _on_element(self, item):
-        if len(self._obj_stack) is 0:
+        if not self._obj_stack:
             self.fire('element', item)
         else:
             self._obj_stack[-1].append(item)
@@ -320,7 +372,7 @@ class ObjectStreamer(events.EventSource):
             Attach all your listeners before calling this method
 
         Args:
-            data (str): input json string
+            data (str|bytes|bytearray|memoryview): input json string, or UTF-8 encoded input json
         """
         try:
             self._streamer.consume(data)
@@ -328,6 +380,18 @@ class ObjectStreamer(events.EventSource):
             print(ye.value)
             raise JSONStreamerException(ye.value)
 
+    def consume_file(self, fp, chunk_size=65536):
+        """Reads and parses a binary file-like object until it is exhausted
+
+        Note:
+            Attach all your listeners before calling this method. See `JSONStreamer.consume_file`
+
+        Args:
+            fp: file-like object opened in binary mode
+            chunk_size (int): number of bytes to read at a time
+        """
+        self._streamer.consume_file(fp, chunk_size)
+
     def close(self):
         """Closes the object streamer"""
         self._streamer.close()
@@ -149,42 +149,49 @@ class YajlParser:
             YAJL_EARR
         )
 
+        # the listener's methods are resolved once here rather than looked up by name on every callback
+        (listener_null, listener_boolean, listener_integer, listener_double, listener_number, listener_string,
+         listener_start_map, listener_map_key, listener_end_map, listener_start_array, listener_end_array) = (
+            getattr(listener, 'on_' + name, None) for name in (
+                'null', 'boolean', 'integer', 'double', 'number', 'string', 'start_map', 'map_key', 'end_map',
+                'start_array', 'end_array'))
+
         def on_null(ctx):
-            return dispatch('on_null', ctx)
+            return dispatch(listener_null, ctx)
 
         def on_boolean(ctx, boolVal):
-            return dispatch('on_boolean', ctx, boolVal)
+            return dispatch(listener_boolean, ctx, boolVal)
 
         def on_integer(ctx, integerVal):
-            return dispatch('on_integer', ctx, integerVal)
+            return dispatch(listener_integer, ctx, integerVal)
 
         def on_double(ctx, doubleVal):
-            return dispatch('on_double', ctx, doubleVal)
+            return dispatch(listener_double, ctx, doubleVal)
 
         def on_number(ctx, stringVal, stringLen):
-            return dispatch('on_number', ctx, string_at(stringVal, stringLen).decode('utf-8'))
+            return dispatch(listener_number, ctx, string_at(stringVal, stringLen).decode('utf-8'))
 
         def on_string(ctx, stringVal, stringLen):
-            return dispatch('on_string', ctx, string_at(stringVal, stringLen).decode('utf-8'))
+            return dispatch(listener_string, ctx, string_at(stringVal, stringLen).decode('utf-8'))
 
         def on_start_map(ctx):
-            return dispatch('on_start_map', ctx)
+            return dispatch(listener_start_map, ctx)
 
         def on_map_key(ctx, stringVal, stringLen):
-            return dispatch('on_map_key', ctx, string_at(stringVal, stringLen).decode('utf-8'))
+            return dispatch(listener_map_key, ctx, string_at(stringVal, stringLen).decode('utf-8'))
 
         def on_end_map(ctx):
-            return dispatch('on_end_map', ctx)
+            return dispatch(listener_end_map, ctx)
 
         def on_start_array(ctx):
-            return dispatch('on_start_array', ctx)
+            return dispatch(listener_start_array, ctx)
 
         def on_end_array(ctx):
-            return dispatch('on_end_array', ctx)
+            return dispatch(listener_end_array, ctx)
 
-        def dispatch(func, *args, **kwargs):
+        def dispatch(func, *args):
             try:
-                getattr(self._listener, func)(*args, **kwargs)
+                func(*args)
                 return 1
             except Exception as e:
                 self._exc_info = sys.exc_info()
@@ -213,6 +220,7 @@ class YajlParser:
         # set self's vars
         self._buffer_size = 65536
         self._listener = listener
+        self._exc_info = None
         self._handler = yajl.yajl_alloc(self.callbacks, None, None)
         self._config(self._handler)
         self.allow_partial_values = True
@@ -237,21 +245,46 @@ class YajlParser:
 
         while len(f):
             data = f.read(self._buffer_size).encode('utf-8')
-            status = yajl.yajl_parse(self._handler, data, len(data))
-            self._listener.parse_buf()
-            if status != OK.value:
-                if status == CLIENT_CANCELLED.value:
-                    if self._exc_info:
-                        exc_info = self._exc_info
-                        raise exc_info[0](exc_info[1]).with_traceback(exc_info[2])
-                    else:
-                        raise YajlError("Client probably cancelled callback")
-                else:
-                    yajl.yajl_get_error.restype = c_char_p
-                    error = yajl.yajl_get_error(self._handler, 1, data, len(data))
-                    raise YajlError(error)
+            self._parse_data(data, len(data))
             if not data: return
 
+    def parse_bytes(self, data, length=None):
+        '''parse a chunk of UTF-8 encoded JSON.
+        :type data: bytes|bytearray|memoryview
+        :param data: chunk to parse, bytes and writable contiguous buffers are handed to yajl without being copied
+        :type length: int
+        :param length: number of leading bytes of `data` to parse, defaults to all of it whatever its item size
+        :raises YajlError: When invalid JSON in input stream found
+        '''
+        if isinstance(data, bytes):
+            if length is None:
+                length = len(data)
+        else:
+            view = memoryview(data)
+            if length is None:
+                length = view.nbytes
+            if view.readonly or not view.c_contiguous:
+                data = view.tobytes()
+            else:
+                data = (c_char * length).from_buffer(view.cast('B'))
+        self._listener.parse_start()
+        self._parse_data(data, length)
+
+    def _parse_data(self, data, length):
+        status = yajl.yajl_parse(self._handler, data, length)
+        self._listener.parse_buf()
+        if status != OK.value:
+            if status == CLIENT_CANCELLED.value:
+                if self._exc_info:
+                    exc_info, self._exc_info = self._exc_info, None
+                    raise exc_info[1].with_traceback(exc_info[2])
+                else:
+                    raise YajlError("Client probably cancelled callback")
+            else:
+                yajl.yajl_get_error.restype = c_char_p
+                error = yajl.yajl_get_error(self._handler, 1, data, length)
+                raise YajlError(error)
+
     def close(self):
         yajl.yajl_free(self._handler)
 
@@ -1,9 +1,18 @@
+import io
+import sys
+from array import array
 import unittest
 from functools import wraps
 
 import jsonstreamer
 
-json_file_name = lambda test_fn: 'tests/json_files/' + test_fn.__name__[5:] + '.json'
+json_file_name = lambda name: 'tests/json_files/' + name + '.json'
+
+
+def read_test_data(name):
+    """reads the json in the named file"""
+    with open(json_file_name(name), encoding='utf-8') as json_file:
+        return json_file.read()
 
 
 def load_test_data(func):
@@ -11,9 +20,7 @@ def load_test_data(func):
 
     @wraps(func)
     def wrapper(self, *args, **kwargs):
-        with open(json_file_name(func), encoding='utf-8') as json_file:
-            json_input = json_file.read()
-        return func(self, json_input)
+        return func(self, read_test_data(func.__name__[5:]))
 
     return wrapper
 
@@ -52,6 +59,156 @@ class JSONStreamerTests(unittest.TestCase):
 
         self._streamer.consume(json_input)
 
+    @load_test_data
+    def test_numbers(self, json_input):
+
+        self._assertions = [('doc_start', None),
+                            ('object_start', None),
+                            ('key', 'positive'),
+                            ('value', 8),
+                            ('key', 'negative'),
+                            ('value', -8),
+                            ('key', 'fraction'),
+                            ('value', -0.5),
+                            ('key', 'exponent'),
+                            ('value', 1000.0),
+                            ('object_end', None),
+                            ('doc_end', None)]
+
+        value_types = []
+        self._streamer.add_listener('value', lambda value: value_types.append(type(value)))
+        self._streamer.consume(json_input)
+        self.assertListEqual(value_types, [int, int, float, float])
+
+    def test_consume_file(self):
+        self._assertions = [('doc_start', None),
+                            ('object_start', None),
+                            ('key', 'apple'),
+                            ('value', 8),
+                            ('key', 'ça va'),
+                            ('value', 'très'),
+                            ('object_end', None),
+                            ('doc_end', None)]
+
+        # a chunk size of 7 splits the two-byte 'ç' across reads
+        json_file = io.BytesIO('{"apple":8, "ça va":"très"}'.encode('utf-8'))
+        self._streamer.consume_file(json_file, chunk_size=7)
+
+    def test_consume_bytes(self):
+        self._assertions = [('doc_start', None),
+                            ('object_start', None),
+                            ('key', 'apple'),
+                            ('value', 8),
+                            ('key', 'ça va'),
+                            ('value', 'très'),
+                            ('object_end', None),
+                            ('doc_end', None)]
+
+        # splits the two-byte 'ç' across calls
+        json_input = '{"apple":8, "ça va":"très"}'.encode('utf-8')
+        self._streamer.consume(json_input[0:14])
+        self._streamer.consume(memoryview(bytearray(json_input))[14:])
+
+    def test_consume_wide_items(self):
+        self._assertions = [('doc_start', None),
+                            ('array_start', None),
+                            ('element', 1),
+                            ('element', 2),
+                            ('element', 3),
+                            ('element', 4),
+                            ('array_end', None),
+                            ('doc_end', None)]
+
+        # 5 two-byte items, all 10 bytes must be parsed
+        self._streamer.consume(memoryview(array('H', b'[1,2,3,4] ')))
+
+    def test_consume_non_contiguous(self):
+        self._assertions = [('doc_start', None),
+                            ('array_start', None),
+                            ('element', 12),
+                            ('element', 3),
+                            ('array_end', None),
+                            ('doc_end', None)]
+
+        # every other byte of a writable buffer
+        self._streamer.consume(memoryview(bytearray(b'[x1x2x,x3x]x'))[::2])
+
+    def test_iter_events(self):
+        self._assertions = [('doc_end', None)]
+        events = list(self._streamer.iter_events('{"apple":8, "banana":["many"]}'))
+        self.assertListEqual(events, [('doc_start', None),
+                                      ('object_start', None),
+                                      ('key', 'apple'),
+                                      ('value', 8),
+                                      ('key', 'banana'),
+                                      ('array_start', None),
+                                      ('element', 'many'),
+                                      ('array_end', None),
+                                      ('object_end', None)])
+
+    def test_iter_events_parses_eagerly(self):
+        self._assertions = [('element', 3), ('array_end', None), ('doc_end', None)]
+        first = self._streamer.iter_events('[1, ')
+        second = self._streamer.iter_events('2, ')
+        self._streamer.consume('3]')
+        self.assertListEqual(list(first), [('doc_start', None), ('array_start', None), ('element', 1)])
+        self.assertListEqual(list(second), [('element', 2)])
+
+    def test_long_integer(self):
+        number = '-' + '1' * 5000
+        self._assertions = [('doc_end', None)]
+        if hasattr(sys, 'get_int_max_str_digits'):
+            # int() refuses this many digits, which must surface as an error and not as -inf
+            with self.assertRaises(jsonstreamer.JSONStreamerException):
+                list(self._streamer.iter_events('[' + number + ']'))
+        else:
+            events = list(self._streamer.iter_events('[' + number + ']'))
+            self.assertEqual(events[2], ('element', int(number)))
+            self.assertIs(type(events[2][1]), int)
+
+    def test_deep_nesting(self):
+        depth = 100
+        self._assertions = [('doc_start', None)] + \
+                           [('array_start', None)] * depth + \
+                           [('object_start', None),
+                            ('key', 'a'),
+                            ('array_start', None),
+                            ('element', 1),
+                            ('array_end', None),
+                            ('object_end', None),
+                            ('element', 2)] + \
+                           [('array_end', None)] * depth + \
+                           [('doc_end', None)]
+
+        self._streamer.consume('[' * depth + '{"a":[1]}, 2' + ']' * depth)
+
+
+class JSONStreamerLimitTests(unittest.TestCase):
+    def tearDown(self):
+        self._streamer.close()
+
+    def test_max_depth(self):
+        self._streamer = jsonstreamer.JSONStreamer(max_depth=3)
+        with self.assertRaisesRegex(jsonstreamer.JSONStreamerException, 'Maximum depth of 3 exceeded'):
+            self._streamer.consume(read_test_data('nested_dict'))
+
+    def test_max_string_size(self):
+        self._streamer = jsonstreamer.JSONStreamer(max_depth=1, max_string_size=5)
+        with self.assertRaisesRegex(jsonstreamer.JSONStreamerException, 'Maximum string size of 5 exceeded'):
+            self._streamer.consume(read_test_data('simple_object'))
+
+    def test_object_streamer_max_depth(self):
+        self._streamer = jsonstreamer.ObjectStreamer(max_depth=3)
+        with self.assertRaisesRegex(jsonstreamer.JSONStreamerException, 'Maximum depth of 3 exceeded'):
+            self._streamer.consume(read_test_data('nested_dict'))
+
+    def test_object_streamer_within_max_depth(self):
+        self._streamer = jsonstreamer.ObjectStreamer(max_depth=4)
+        pairs = []
+        self._streamer.add_listener('pair', pairs.append)
+        self._streamer.consume(read_test_data('nested_dict'))
+        self.assertListEqual(pairs, [('params', {'dependencies': [{'app': 'Example'}]})])
+
 
 class ObjectStreamerTests(unittest.TestCase):
     def setUp(self):
@@ -103,6 +260,16 @@ class ObjectStreamerTests(unittest.TestCase):
                             ('array_stream_end', None)]
         self._streamer.consume(json_input)
 
+    @load_test_data
+    def test_nested_arrays(self, json_input):
+        self._assertions = [('array_stream_start', None),
+                            ('element', 1),
+                            ('element', [2, [3, {"a": [4, [5]], "b": {"c": []}}]]),
+                            ('element', {"d": None}),
+                            ('element', [[]]),
+                            ('array_stream_end', None)]
+        self._streamer.consume(json_input)
+
     @load_test_data
     def test_spl_chars_in_value(self, json_input):
         self._assertions = [('object_stream_start', None),
@@ -201,5 +368,19 @@ class ObjectStreamerListenerTests(unittest.TestCase):
         self._streamer.consume(json_input[0:8])
         self._streamer.consume(json_input[8:])
 
+    def test_shared_keys(self):
+        self._assertions = []
+        elements = []
+        self._streamer.add_listener('element', elements.append)
+        self._streamer.consume('[{"name": 1}, {"name": 2}]')
+        first_key, second_key = (next(iter(element)) for element in elements)
+        self.assertIs(first_key, second_key)
+
+    def test_key_cache_is_bounded(self):
+        self._assertions = []
+        self._streamer.consume('[{' + ', '.join('"key{}": 1'.format(i) for i in range(2000)) + '}]')
+        self.assertEqual(self._streamer._shared_key.cache_info().currsize, jsonstreamer.jsonstreamer._KEY_CACHE_SIZE)
+
+
 if __name__ == '__main__':
     unittest.main(verbosity=2)